@@ -1,19 +1,13 @@
 import streamlit as st
 from config import setup_page_config, display_header
 from preview import load_bed, show_metrics_banner
-from mergeBed import handle_merge_operation
-from intersectBed import load_bed_int, intersect_bedtools
-from sort import sort_bed, handle_sort_operation
-import pandas as pd
-import gzip
-import io
 
 # 👉 Move setup_page_config to the very beginning of the script
 setup_page_config()
 
-def setup_styles():
+def get_styles():
     """Custom CSS for button colors"""
-    st.write("""
+    return """
     <style>
         /* Inactive buttons */
         .stButton>button:disabled {
@@ -35,26 +29,12 @@ def setup_styles():
             transform: translateY(-1px);
         }
     </style>
-    """, unsafe_allow_html=True)
+    """
 
-def read_compressed_file(uploaded_file):
-    """Read compressed .gz files"""
-    try:
-        if uploaded_file.name.endswith('.gz'):
-            # Read the compressed file
-            with gzip.open(uploaded_file, 'rt') as f:
-                content = f.read()
-            # Create a StringIO object for pandas
-            file_obj = io.StringIO(content)
-            return file_obj
-        else:
-            # Read the normal file
-            content = uploaded_file.getvalue().decode('utf-8')
-            file_obj = io.StringIO(content)
-            return file_obj
-    except Exception as e:
-        st.error(f"Error reading compressed file: {str(e)}")
-        return None
+def setup_styles():
+    """Inject the custom CSS"""
+    # Emitted on every rerun: Streamlit removes elements a rerun does not re-send
+    st.markdown(get_styles(), unsafe_allow_html=True)
 
 def main():
     # Interface setup
@@ -62,10 +42,8 @@ def main():
     display_header()
     
     # Initialize session states to keep context
-    if 'intersect_mode' not in st.session_state:
-        st.session_state.intersect_mode = False
-    if 'file_a_uploaded' not in st.session_state:
-        st.session_state.file_a_uploaded = None
+    for key, default in {'intersect_mode': False, 'file_a_uploaded': None}.items():
+        st.session_state.setdefault(key, default)
     
     # File upload (main file) - ONLY .bed NOW
     uploaded_file = st.file_uploader(
@@ -74,10 +52,15 @@ def main():
         help="Supported format: .bed"  # ← CHANGED: Removed other formats
     )
           
-    # Initialize df
+    # Initialize df (parsed once per upload, then reused across reruns);
+    # a failed load is retried each run: the cache hit replays its error message
     df = None
     if uploaded_file is not None:
-        df = load_bed(uploaded_file)
+        if (st.session_state.get('df_key') != uploaded_file.file_id
+                or st.session_state.get('df') is None):
+            st.session_state['df'] = load_bed(uploaded_file)
+            st.session_state['df_key'] = uploaded_file.file_id
+        df = st.session_state.get('df')
     
     # Action buttons
     cols = st.columns(4)
@@ -105,7 +88,9 @@ def main():
             show_metrics_banner(df)
             st.dataframe(df.head(100))
             
+        # Operation modules are imported on first use to speed up the first paint
         if merge_btn:
+            from mergeBed import handle_merge_operation
             handle_merge_operation(df)
 
         if intersect_btn:
@@ -113,11 +98,14 @@ def main():
             st.session_state.intersect_mode = True
             
         if sort_btn:
+            from sort import handle_sort_operation
             show_metrics_banner(df)
             handle_sort_operation(df)
     
     # Section for the second file (only in intersection mode)
     if st.session_state.intersect_mode:
+        from intersectBed import (load_bed_int_from_df, intersect_bedtools,
+                                  intersection_to_bed_gz, intersection_to_arrow)
         st.write("---")
         st.subheader("⚡ BED Intersection")
         st.info("Search for overlapping regions between the two files")
@@ -140,54 +128,73 @@ def main():
             # Store the file in session state
             st.session_state.file_a_uploaded = uploaded_file_a
             
-            # Load both files
-            if uploaded_file is not None and uploaded_file_a is not None:
-                df1, df2 = load_bed_int(uploaded_file, uploaded_file_a)
+            # File A is the already-parsed main upload; only file B is read here
+            if df is not None and uploaded_file_a is not None:
+                df1, df2 = load_bed_int_from_df(df, uploaded_file_a, uploaded_file)
                 
                 if df1 is not None and df2 is not None:
                     st.success("✅ Files loaded successfully")
+                    n_a, n_b = len(df1), len(df2)
                     
                     # Display basic info
                     col_info1, col_info2 = st.columns(2)
                     with col_info1:
-                        st.write(f"**File A:** {len(df1)} regions")
+                        st.write(f"**File A:** {n_a} regions")
                     with col_info2:
-                        st.write(f"**File B:** {len(df2)} regions")
+                        st.write(f"**File B:** {n_b} regions")
                     
                     # Execute intersection when button is clicked
+                    result_key = (uploaded_file.file_id, uploaded_file_a.file_id)
                     if run_intersect_btn:
                         with st.spinner("Searching for overlaps..."):
                             # Execute SIMPLIFIED intersection (without options)
                             result_df = intersect_bedtools(df1, df2)
                             
+                            # Keep only what is displayed; the full result stays in the cache
                             if result_df is not None:
-                                if len(result_df) > 0:
-                                    st.success(f"✅ {len(result_df)} overlaps found!")
-                                    
-                                    # Results display
-                                    st.subheader("📊 Intersection Results")
-                                    st.dataframe(result_df.head(20))
-                                    
-                                    # Metrics
-                                    col_met1, col_met2, col_met3 = st.columns(3)
-                                    with col_met1:
-                                        st.metric("Regions in A", len(df1))
-                                    with col_met2:
-                                        st.metric("Regions in B", len(df2))
-                                    with col_met3:
-                                        st.metric("Overlaps", len(result_df))
-                                    
-                                    # Download results
-                                    csv = result_df.to_csv(index=False, sep='\t')
-                                    st.download_button(
-                                        label="📥 Download Results",
-                                        data=csv,
-                                        file_name="intersection_results.bed",
-                                        mime="text/plain",
-                                        use_container_width=True
-                                    )
-                                else:
-                                    st.warning("⚠️ No overlaps found between files")
+                                st.session_state['result_key'] = result_key
+                                st.session_state['result_head'] = result_df.head(20).copy()
+                                st.session_state['result_len'] = len(result_df)
+                            del result_df
+                    
+                    if st.session_state.get('result_key') == result_key:
+                        n_overlap = st.session_state['result_len']
+                        if n_overlap > 0:
+                            st.success(f"✅ {n_overlap} overlaps found!")
+                            
+                            # Results display
+                            st.subheader("📊 Intersection Results")
+                            st.dataframe(st.session_state['result_head'])
+                            
+                            # Metrics
+                            col_met1, col_met2, col_met3 = st.columns(3)
+                            with col_met1:
+                                st.metric("Regions in A", n_a)
+                            with col_met2:
+                                st.metric("Regions in B", n_b)
+                            with col_met3:
+                                st.metric("Overlaps", n_overlap)
+                            
+                            # Download results, serialized only when the button is clicked
+                            col_dl1, col_dl2 = st.columns(2)
+                            with col_dl1:
+                                st.download_button(
+                                    label="📥 Download Results",
+                                    data=lambda: intersection_to_bed_gz(df1, df2),
+                                    file_name="intersection_results.bed.gz",
+                                    mime="application/gzip",
+                                    use_container_width=True
+                                )
+                            with col_dl2:
+                                st.download_button(
+                                    label="📥 Download Arrow",
+                                    data=lambda: intersection_to_arrow(df1, df2),
+                                    file_name="intersection_results.arrows",
+                                    mime="application/vnd.apache.arrow.stream",
+                                    use_container_width=True
+                                )
+                        else:
+                            st.warning("⚠️ No overlaps found between files")
         else:
             if st.session_state.file_a_uploaded is None:
                 st.warning("⚠️ Please upload the second file to continue")
@@ -197,6 +204,7 @@ def main():
         if st.button("❌ Exit Intersection Mode"):
             st.session_state.intersect_mode = False
             st.session_state.file_a_uploaded = None
+            st.session_state.pop('result_key', None)
             st.rerun()
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+import hashlib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+# Identify an upload by its metadata instead of hashing its full contents
+UPLOAD_HASH_FUNCS = {UploadedFile: lambda f: (f.name, f.size, f.file_id)}
+
+def frame_hash(df: pd.DataFrame) -> tuple:
+    """
+    Cache key covering every row and column: Streamlit's default DataFrame
+    hash only samples large frames, so an edit outside the sample would hit
+    a stale entry
+    """
+    digest = hashlib.blake2b(pd.util.hash_pandas_object(df).to_numpy().tobytes(), digest_size=16)
+    return tuple(df.columns), tuple(map(str, df.dtypes)), digest.hexdigest()
+
+# Full-content key for caches of results derived from a whole dataframe
+FRAME_HASH_FUNCS = {pd.DataFrame: frame_hash}
+
+# Standard BED column names
+BED_COLUMNS = ['chrom', 'start', 'end', 'name', 'score', 'strand', 
+               'thickStart', 'thickEnd', 'itemRgb', 'blockCount', 
+               'blockSizes', 'blockStarts']
+
+def chrom_sort_key(chrom):
+    """Natural genomic order: chr1..chr22, then X, Y, M, then anything else"""
+    name = str(chrom)
+    short = name[3:] if name.lower().startswith('chr') else name
+    if short.isdigit():
+        return (0, int(short), name)
+    if short.upper() in ('X', 'Y', 'M', 'MT'):
+        return (1, ('X', 'Y', 'M', 'MT').index(short.upper()), name)
+    return (2, 0, name)
+
+def optimize_bed_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store chrom as an ordered categorical (natural genomic order), strand as
+    a categorical and start/end as int32 when they fit, for faster
+    groupby/sort/value_counts and less memory
+    """
+    chroms = sorted(df['chrom'].dropna().unique(), key=chrom_sort_key)
+    df['chrom'] = df['chrom'].astype(pd.CategoricalDtype(chroms, ordered=True))
+    if 'strand' in df.columns:
+        df['strand'] = df['strand'].astype('category')
+    for col in ('start', 'end'):
+        if (col in df.columns and pd.api.types.is_numeric_dtype(df[col])
+                and df[col].notna().all() and df[col].abs().max() < 2**31):
+            df[col] = df[col].astype('int32')
+    return df
+
+def read_bed_arrow(uploaded_file) -> pd.DataFrame:
+    """
+    Parse a BED file (plain or .gz) with Arrow's multithreaded CSV reader:
+    dictionary-encoded chrom, int32 coordinates, other columns as string
+    """
+    # Zero-copy view of the uploaded bytes; never closes the upload itself
+    source = pa.BufferReader(uploaded_file.getvalue())
+    if uploaded_file.name.endswith('.gz'):
+        source = pa.CompressedInputStream(source, 'gzip')
+    # Typed schema: a non-integer coordinate raises ArrowInvalid (pandas fallback)
+    column_types = {f"f{i}": pa.string() for i in range(3, 12)}
+    column_types.update(f0=pa.dictionary(pa.int32(), pa.string()), f1=pa.int32(), f2=pa.int32())
+    table = pacsv.read_csv(
+        source,
+        read_options=pacsv.ReadOptions(autogenerate_column_names=True, block_size=8 << 20),
+        parse_options=pacsv.ParseOptions(delimiter='\t'),
+        convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+    )
+    # Drop '#' comment lines, as comment='#' does for pandas;
+    # the prefix test runs on the dictionary values, not on every row
+    chrom = table.column(0).combine_chunks()
+    is_comment = pc.starts_with(chrom.dictionary, '#')
+    if pc.any(is_comment).as_py():
+        table = table.filter(pc.invert(pc.take(is_comment, chrom.indices)))
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+def read_bed(uploaded_file) -> pd.DataFrame:
+    """
+    Shared BED parser for every loader: Arrow first, pandas for files Arrow
+    rejects; named columns, numeric coordinates, compact dtypes
+    """
+    try:
+        df = read_bed_arrow(uploaded_file)
+    except pa.ArrowInvalid:
+        # Ragged rows or inline comments: let pandas handle them
+        uploaded_file.seek(0)
+        df = pd.read_csv(
+            uploaded_file,
+            sep="\t",
+            header=None,
+            comment='#',
+            compression='gzip' if uploaded_file.name.endswith('.gz') else None,
+            # chrom as category, coordinates parsed by the C engine,
+            # optional columns kept as string
+            dtype={0: 'category', **{i: str for i in range(3, 12)}}
+        )
+    
+    # Name available columns
+    df.columns = BED_COLUMNS[:len(df.columns)]
+    
+    # Convert start and end to numeric
+    if 'start' in df.columns:
+        df['start'] = pd.to_numeric(df['start'], errors='coerce')
+    if 'end' in df.columns:
+        df['end'] = pd.to_numeric(df['end'], errors='coerce')
+    
+    return optimize_bed_dtypes(df)
+
+def needs_quoting(table: pa.Table) -> bool:
+    """
+    True if a text field holds a quote, tab or line break, which only a
+    quoting writer can emit (e.g. GTF-derived names like gene_id "X";)
+    """
+    for column in table.columns:
+        values = column.combine_chunks()
+        if pa.types.is_dictionary(values.type):
+            values = values.dictionary
+        if ((pa.types.is_string(values.type) or pa.types.is_large_string(values.type))
+                and pc.any(pc.match_substring_regex(values, '["\t\r\n]')).as_py()):
+            return True
+    return False
+
+def write_tsv(df: pd.DataFrame, sink) -> None:
+    """
+    Write a dataframe as TSV with a header line through pyarrow's C++ CSV
+    writer, straight into a binary sink (no intermediate str)
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if needs_quoting(table):
+        # Arrow's unquoted mode rejects such fields: pandas quotes just those
+        df.to_csv(sink, sep='\t', index=False)
+        return
+    sink.write(('\t'.join(map(str, df.columns)) + '\n').encode('utf-8'))
+    pacsv.write_csv(table, sink,
+                    write_options=pacsv.WriteOptions(include_header=False, delimiter='\t',
+                                                     quoting_style='none'))
@@ -3,47 +3,34 @@ import streamlit as st
 import gzip
 import io
 import numpy as np
+import os
+import pyarrow as pa
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from bed_io import UPLOAD_HASH_FUNCS, read_bed, write_tsv
+
+# Nombre maximal de paires candidates testées à la fois par le balayage
+MAX_CANDIDATES = 1 << 22
+
+def _frame_key(df):
+    """Clé de cache d'un DataFrame BED : hash des colonnes chrom, start, end"""
+    return pd.util.hash_pandas_object(df[['chrom', 'start', 'end']], index=False).values.tobytes()
 
 def read_bed_file(uploaded_file):
     """
     Lit un fichier BED (normal ou compressé) et retourne un DataFrame
+    Même lecteur que l'aperçu (bed_io.read_bed) : Arrow, puis pandas en secours
     """
     try:
-        # Vérifier si c'est un fichier compressé
-        if uploaded_file.name.endswith('.gz'):
-            with gzip.open(uploaded_file, 'rt') as f:
-                content = f.read()
-            file_obj = io.StringIO(content)
-        else:
-            content = uploaded_file.getvalue().decode('utf-8')
-            file_obj = io.StringIO(content)
-        
-        # Détecter le nombre de colonnes
-        first_line = content.split('\n')[0]
-        num_columns = len(first_line.split('\t'))
-        
-        bed_cols = ['chrom', 'start', 'end', 'name', 'score', 'strand', 
-                   'thickStart', 'thickEnd', 'itemRgb', 'blockCount', 
-                   'blockSizes', 'blockStarts']
-        
-        df = pd.read_csv(file_obj, sep='\t', header=None, 
-                        names=bed_cols[:num_columns], comment='#')
-        
-        return df
-        
+        return read_bed(uploaded_file)
     except Exception as e:
         st.error(f"Erreur lecture fichier: {str(e)}")
         return None
 
-def load_bed_int(file1, file2):
+def show_structures(df1, df2):
     """
-    Charge deux fichiers BED pour l'intersection
+    Affiche la structure des deux fichiers pour débogage
     """
-    df1 = read_bed_file(file1)
-    df2 = read_bed_file(file2)
-    
-    # Afficher la structure des fichiers pour débogage
     if df1 is not None and df2 is not None:
         st.write(f"**Structure Fichier A:** {df1.shape[1]} colonnes - {list(df1.columns)}")
         st.write(f"**Structure Fichier B:** {df2.shape[1]} colonnes - {list(df2.columns)}")
@@ -51,7 +38,39 @@ def load_bed_int(file1, file2):
         if df1.shape[1] != df2.shape[1]:
             st.warning("⚠️ Les fichiers ont des structures différentes!")
             st.info("L'intersection utilisera seulement les 3 premières colonnes (chrom, start, end)")
-    
+
+def same_upload(file1, file2):
+    """
+    Vrai si les deux uploads ont le même contenu (même fichier envoyé en A et en B) :
+    comparaison des tailles puis des octets en mémoire, sans parsing
+    """
+    return file1.size == file2.size and file1.getvalue() == file2.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs=UPLOAD_HASH_FUNCS)
+def load_bed_int(file1, file2):
+    """
+    Charge deux fichiers BED pour l'intersection
+    """
+    df1 = read_bed_file(file1)
+    # Auto-intersection : un seul parsing, et donc un seul index d'intervalles
+    df2 = df1 if same_upload(file1, file2) else read_bed_file(file2)
+    show_structures(df1, df2)
+    return df1, df2
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs=UPLOAD_HASH_FUNCS)
+def load_bed_single(uploaded_file):
+    """
+    Charge un seul fichier BED (mis en cache par fichier)
+    """
+    return read_bed_file(uploaded_file)
+
+def load_bed_int_from_df(df1, file2, file1=None):
+    """
+    Comme load_bed_int, mais réutilise le DataFrame déjà chargé du fichier A :
+    seul le fichier B est lu (et pas du tout s'il est identique à file1)
+    """
+    df2 = df1 if file1 is not None and same_upload(file1, file2) else load_bed_single(file2)
+    show_structures(df1, df2)
     return df1, df2
 
 def intersect_bedtools(df1, df2):
@@ -59,102 +78,265 @@ def intersect_bedtools(df1, df2):
     Effectue l'intersection entre deux DataFrames BED
     Version basique avec wa et wb
     """
+    # Préfiltre peu coûteux : seuls les chromosomes communs peuvent se chevaucher.
+    # Seul B est filtré : A reste entier pour que son index (en cache) ne
+    # dépende pas des chromosomes du fichier B
+    chroms_a = set(df1['chrom'].unique())
+    chroms_b = set(df2['chrom'].unique())
+    common = chroms_a & chroms_b
+    if not common:
+        return pd.DataFrame()
+    if len(common) < len(chroms_b):
+        df2 = df2[df2['chrom'].isin(common)]
     return intersect_bedtools_advanced(df1, df2, {'wa': True, 'wb': True})
 
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_key})
+def intersection_to_bed_gz(df1, df2):
+    """
+    Résultat de intersect_bedtools sérialisé en TSV compressé (gzip niveau 1)
+    """
+    result_df = intersect_bedtools(df1, df2)
+    buf = io.BytesIO()
+    # Sérialiser directement dans le compresseur, sans str intermédiaire
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=1) as gz:
+        write_tsv(result_df, gz)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_key})
+def intersection_to_arrow(df1, df2):
+    """
+    Résultat de intersect_bedtools au format binaire Arrow IPC (stream)
+    """
+    table = pa.Table.from_pandas(intersect_bedtools(df1, df2), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def sort_by_chrom(df):
+    """
+    Tri unique par (chromosome, start) : ordre des lignes et tranche de chaque
+    chromosome dans les tableaux triés (vues NumPy, aucun sous-DataFrame)
+    """
+    codes, uniques = pd.factorize(df['chrom'])
+    order = np.lexsort((df['start'].to_numpy(), codes))
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    slices = {uniques[k]: slice(bounds[k], bounds[k + 1]) for k in range(len(uniques))}
+    return order, slices
+
+@st.cache_resource(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_key})
+def build_interval_index(df):
+    """
+    Index d'intervalles implicite par chromosome : tableaux triés par start,
+    en deux niveaux de longueur (courts / 1 % les plus longs) pour que quelques
+    très longs intervalles n'élargissent pas la fenêtre de recherche de tous
+    {chrom: [(starts, ends, positions, longueur max, max cumulé des ends), ...]}
+    Partagé entre les reruns : réutilisé tant que le fichier indexé ne change pas
+    """
+    order, slices = sort_by_chrom(df)
+    all_starts = df['start'].to_numpy()[order]
+    all_ends = df['end'].to_numpy()[order]
+    all_positions = df.index.to_numpy()[order]
+    
+    index = {}
+    for chrom, rows in slices.items():
+        starts = all_starts[rows]
+        ends = all_ends[rows]
+        positions = all_positions[rows]
+        lengths = ends - starts
+        is_long = lengths > np.quantile(lengths, 0.99)
+        
+        # Chaque niveau reste trié par start (masque booléen = ordre conservé)
+        tiers = []
+        for in_tier in (~is_long, is_long):
+            if in_tier.any():
+                tier_starts = starts[in_tier]
+                tier_ends = ends[in_tier]
+                tiers.append((tier_starts, tier_ends, positions[in_tier],
+                              lengths[in_tier].max(), np.maximum.accumulate(tier_ends)))
+        index[chrom] = tiers
+    return index
+
+@st.cache_resource
+def get_executor():
+    """
+    Pool de threads partagé entre les reruns pour l'intersection par chromosome
+    """
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+def tier_overlaps(q_starts, q_ends, q_positions, tier):
+    """
+    Paires (positions requête, positions indexées) qui se chevauchent dans un niveau
+    Balayage vectorisé : aucune boucle Python par intervalle
+    """
+    i_starts, i_ends, i_positions, i_max_len, i_ends_cummax = tier
+    
+    # Fenêtre candidate [left, right[ : start indexé < end requête, et à gauche
+    # tout intervalle se termine avant le start requête (max cumulé des ends,
+    # borné aussi par la longueur max)
+    lefts = np.maximum(np.searchsorted(i_ends_cummax, q_starts, side='right'),
+                       np.searchsorted(i_starts, q_starts - i_max_len, side='right'))
+    rights = np.searchsorted(i_starts, q_ends, side='left')
+    counts = np.maximum(rights - lefts, 0)
+    
+    # Par blocs de requêtes d'au plus MAX_CANDIDATES candidats : mémoire bornée
+    # même quand les fenêtres sont larges
+    cum_counts = np.cumsum(counts)
+    bounds = np.searchsorted(cum_counts, np.arange(MAX_CANDIDATES, cum_counts[-1] if len(cum_counts) else 0,
+                                                   MAX_CANDIDATES), side='right')
+    pairs_q = []
+    pairs_i = []
+    for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(counts)]):
+        if lo == hi:
+            continue
+        block_counts = counts[lo:hi]
+        # Aplatir les fenêtres du bloc : une requête répétée par candidat
+        q_idx = np.repeat(np.arange(lo, hi), block_counts)
+        offsets = np.arange(len(q_idx)) - np.repeat(np.cumsum(block_counts) - block_counts, block_counts)
+        candidates = np.repeat(lefts[lo:hi], block_counts) + offsets
+        
+        # Test exact sur les candidats
+        hits = i_ends[candidates] > q_starts[q_idx]
+        pairs_q.append(q_positions[q_idx[hits]])
+        pairs_i.append(i_positions[candidates[hits]])
+    
+    if not pairs_q:
+        return q_positions[:0], i_positions[:0]
+    return np.concatenate(pairs_q), np.concatenate(pairs_i)
+
+def chrom_overlaps(q_starts, q_ends, q_positions, index_entry):
+    """
+    Paires (positions requête, positions indexées) qui se chevauchent sur un chromosome
+    """
+    pairs = [tier_overlaps(q_starts, q_ends, q_positions, tier) for tier in index_entry]
+    return (np.concatenate([pair_q for pair_q, _ in pairs]),
+            np.concatenate([pair_i for _, pair_i in pairs]))
+
+def coordinates(df):
+    """
+    Colonnes chrom, start, end (projection par nom, coordonnées numériques),
+    sans les lignes incomplètes (index = position)
+    """
+    return pd.DataFrame({
+        'chrom': df['chrom'],
+        'start': pd.to_numeric(df['start'], errors='coerce'),
+        'end': pd.to_numeric(df['end'], errors='coerce')
+    }).dropna().reset_index(drop=True)
+
+def non_intersecting_a(df_a, has_hit):
+    """
+    Régions de A sans chevauchement (-v), au format de sortie A_*
+    """
+    result_df = df_a.loc[~has_hit, ['chrom', 'start', 'end']].copy()
+    result_df.columns = ['A_chrom', 'A_start', 'A_end']
+    return result_df
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _frame_key})
 def intersect_bedtools_advanced(df1, df2, options=None):
     """
     Version avancée avec plus d'options pour l'intersection
     Implémentation Python pure optimisée
+    Mise en cache par (fichiers, options) : relancer la même intersection est immédiat
     """
     if options is None:
         options = {}
     
     try:
-        # Préparer les données avec seulement les 3 premières colonnes
-        df_a = df1.iloc[:, :3].copy()
-        df_b = df2.iloc[:, :3].copy()
+        # Préparer les données avec seulement les colonnes chrom, start, end
+        df_a = coordinates(df1)
+        df_b = coordinates(df2)
         
-        df_a.columns = ['chrom', 'start', 'end']
-        df_b.columns = ['chrom', 'start', 'end']
+        # Optimisation: B trié une seule fois par chromosome (tableaux contigus)
+        order_b, slices_b = sort_by_chrom(df_b)
+        b_starts_sorted = df_b['start'].to_numpy()[order_b]
+        b_ends_sorted = df_b['end'].to_numpy()[order_b]
         
-        # Convertir en types numériques
-        df_a['start'] = pd.to_numeric(df_a['start'], errors='coerce')
-        df_a['end'] = pd.to_numeric(df_a['end'], errors='coerce')
-        df_b['start'] = pd.to_numeric(df_b['start'], errors='coerce')
-        df_b['end'] = pd.to_numeric(df_b['end'], errors='coerce')
+        # Index d'intervalles de A, le fichier principal qui reste fixe quand
+        # on change de fichier B (tableaux triés par start, façon cgranges)
+        index_a = build_interval_index(df_a)
         
-        # Supprimer les lignes avec des valeurs manquantes
-        df_a = df_a.dropna()
-        df_b = df_b.dropna()
+        common_chroms = set(index_a.keys()) & set(slices_b.keys())
         
-        results = []
-        
-        # Optimisation: grouper par chromosome
-        chrom_groups_a = df_a.groupby('chrom')
-        chrom_groups_b = df_b.groupby('chrom')
-        
-        common_chroms = set(chrom_groups_a.groups.keys()) & set(chrom_groups_b.groups.keys())
+        # Régions de A qui chevauchent au moins une région de B (pour -v)
+        has_hit = np.zeros(len(df_a), dtype=bool)
         
         if not common_chroms:
             st.info("Aucun chromosome commun entre les fichiers")
+            if options.get('v', False):
+                return non_intersecting_a(df_a, has_hit)
             return pd.DataFrame()
         
         progress_bar = st.progress(0)
         total_chroms = len(common_chroms)
         
-        for i, chrom in enumerate(common_chroms):
+        # Chromosomes indépendants : un chromosome par tâche, B interroge l'index de A
+        executor = get_executor()
+        futures = []
+        for chrom in common_chroms:
+            rows = slices_b[chrom]
+            futures.append(executor.submit(chrom_overlaps,
+                                           b_starts_sorted[rows],
+                                           b_ends_sorted[rows],
+                                           order_b[rows],
+                                           index_a[chrom]))
+        
+        # Paires (position dans A, position dans B) des régions qui se chevauchent
+        pairs_a = []
+        pairs_b = []
+        
+        # Au plus une dizaine de mises à jour de la barre (un message par mise à jour)
+        update_every = max(1, total_chroms // 10)
+        for i, future in enumerate(as_completed(futures)):
             # Mettre à jour la barre de progression
-            progress_bar.progress((i + 1) / total_chroms)
+            if (i + 1) % update_every == 0 or i == total_chroms - 1:
+                progress_bar.progress((i + 1) / total_chroms)
+            chrom_pairs_b, chrom_pairs_a = future.result()
+            pairs_a.append(chrom_pairs_a)
+            pairs_b.append(chrom_pairs_b)
+        
+        progress_bar.empty()
+        
+        if pairs_a:
+            # Ordre déterministe : lignes de A, puis de B, dans l'ordre des fichiers
+            pos_a = np.concatenate(pairs_a)
+            pos_b = np.concatenate(pairs_b)
+            order = np.lexsort((pos_b, pos_a))
+            pos_a = pos_a[order]
+            pos_b = pos_b[order]
             
-            # Filtrer par chromosome
-            regions_a = chrom_groups_a.get_group(chrom)
-            regions_b = chrom_groups_b.get_group(chrom)
+            # Colonnes construites directement depuis les tableaux NumPy
+            # (chrom catégoriel pris par ses codes, sans passer par des lignes)
+            a_starts = df_a['start'].to_numpy()[pos_a]
+            a_ends = df_a['end'].to_numpy()[pos_a]
+            b_starts = df_b['start'].to_numpy()[pos_b]
+            b_ends = df_b['end'].to_numpy()[pos_b]
             
-            # Convertir en arrays numpy pour performance
-            a_starts = regions_a['start'].values
-            a_ends = regions_a['end'].values
-            b_starts = regions_b['start'].values
-            b_ends = regions_b['end'].values
+            # Calculer l'intersection (les intervalles vides ne comptent pas)
+            overlap = np.minimum(a_ends, b_ends) - np.maximum(a_starts, b_starts)
+            # Option -f : recouvrement minimum en fraction de la longueur de A
+            covers = overlap >= options.get('f', 0) * (a_ends - a_starts)
+            keep = (overlap > 0) & covers
             
-            # Vérifier les intersections de manière vectorisée
-            for idx_a, (start_a, end_a) in enumerate(zip(a_starts, a_ends)):
-                # Trouver les régions B qui chevauchent avec cette région A
-                overlaps = (b_starts < end_a) & (b_ends > start_a)
-                
-                if np.any(overlaps):
-                    overlapping_indices = np.where(overlaps)[0]
-                    
-                    for idx_b in overlapping_indices:
-                        start_b, end_b = b_starts[idx_b], b_ends[idx_b]
-                        
-                        # Calculer l'intersection
-                        overlap_start = max(start_a, start_b)
-                        overlap_end = min(end_a, end_b)
-                        overlap_length = overlap_end - overlap_start
-                        
-                        if overlap_length > 0:
-                            result_row = {
-                                'A_chrom': chrom,
-                                'A_start': start_a,
-                                'A_end': end_a,
-                                'B_chrom': chrom,
-                                'B_start': start_b,
-                                'B_end': end_b
-                            }
-                            
-                            if options.get('wo', False):
-                                result_row['overlap'] = overlap_length
-                            
-                            results.append(result_row)
+            result_df = pd.DataFrame({
+                'A_chrom': df_a['chrom'].array.take(pos_a[keep]),
+                'A_start': a_starts[keep],
+                'A_end': a_ends[keep],
+                'B_chrom': df_b['chrom'].array.take(pos_b[keep]),
+                'B_start': b_starts[keep],
+                'B_end': b_ends[keep],
+                'overlap': overlap[keep]
+            }, copy=False)
+            has_hit[pos_a[covers]] = True
         
-        progress_bar.empty()
+        # Option -v: les régions de A sans aucun chevauchement, marquées pendant
+        # le même balayage (pas de seconde passe)
+        if options.get('v', False):
+            return non_intersecting_a(df_a, has_hit)
         
-        if not results:
+        if not pairs_a or result_df.empty:
             st.info("ℹ️ Aucune intersection trouvée entre les fichiers")
             return pd.DataFrame()
         
-        result_df = pd.DataFrame(results)
-        
         # Adapter les colonnes en fonction des options
         if options.get('wo', False):
             # -wo ajoute une colonne avec le pourcentage d'overlap
@@ -172,93 +354,68 @@ def intersect_bedtools_advanced(df1, df2, options=None):
             # Par défaut : 3 colonnes (fichier A)
             result_df = result_df[['A_chrom', 'A_start', 'A_end']].drop_duplicates()
         
-        # Option -v: trouver les non-intersections
-        if options.get('v', False):
-            # Pour -v, on retourne les régions de A qui n'intersectent pas B
-            all_a_indices = set(range(len(df_a)))
-            intersecting_a_indices = set()
-            
-            # Identifier les indices de A qui intersectent
-            for chrom in common_chroms:
-                regions_a = chrom_groups_a.get_group(chrom)
-                regions_b = chrom_groups_b.get_group(chrom)
-                
-                a_starts = regions_a['start'].values
-                a_ends = regions_a['end'].values
-                b_starts = regions_b['start'].values
-                b_ends = regions_b['end'].values
-                
-                for idx_a, (start_a, end_a) in enumerate(zip(a_starts, a_ends)):
-                    overlaps = (b_starts < end_a) & (b_ends > start_a)
-                    if np.any(overlaps):
-                        original_idx = regions_a.index[idx_a]
-                        intersecting_a_indices.add(original_idx)
-            
-            # Prendre les régions de A qui n'intersectent pas
-            non_intersecting = df_a[~df_a.index.isin(intersecting_a_indices)]
-            result_df = non_intersecting[['chrom', 'start', 'end']].copy()
-            result_df.columns = ['A_chrom', 'A_start', 'A_end']
-        
         return result_df
         
     except Exception as e:
         st.error(f"Erreur lors de l'intersection: {str(e)}")
         return None
 
-# Interface Streamlit
-st.title("🔍 Intersection de fichiers BED")
-st.write("Cet outil permet de trouver les intersections entre deux fichiers BED")
+# Interface Streamlit (exécution directe uniquement, pas à l'import depuis app.py)
+if __name__ == "__main__":
+    st.title("🔍 Intersection de fichiers BED")
+    st.write("Cet outil permet de trouver les intersections entre deux fichiers BED")
 
-# Upload des fichiers
-file1 = st.file_uploader("Télécharger le premier fichier BED (A)", type=['bed', 'bed.gz'])
-file2 = st.file_uploader("Télécharger le second fichier BED (B)", type=['bed', 'bed.gz'])
+    # Upload des fichiers
+    file1 = st.file_uploader("Télécharger le premier fichier BED (A)", type=['bed', 'bed.gz'])
+    file2 = st.file_uploader("Télécharger le second fichier BED (B)", type=['bed', 'bed.gz'])
 
-if file1 and file2:
-    # Charger les fichiers
-    df1, df2 = load_bed_int(file1, file2)
+    if file1 and file2:
+        # Charger les fichiers
+        df1, df2 = load_bed_int(file1, file2)
     
-    if df1 is not None and df2 is not None:
-        st.success("✅ Files loaded successfully")
-        st.write(f"**File A:** {len(df1)} regions")
-        st.write(f"**File B:** {len(df2)} regions")
+        if df1 is not None and df2 is not None:
+            st.success("✅ Files loaded successfully")
+            st.write(f"**File A:** {len(df1)} regions")
+            st.write(f"**File B:** {len(df2)} regions")
         
-        # Options d'intersection
-        st.subheader("Options d'intersection")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            wa = st.checkbox("Inclure régions A (-wa)", value=True)
-            wb = st.checkbox("Inclure régions B (-wb)", value=True)
-        with col2:
-            wo = st.checkbox("Ajouter longueur overlap (-wo)", value=False)
-            v = st.checkbox("Trouver non-intersections (-v)", value=False)
-        with col3:
-            min_overlap = st.slider("Recouvrement minimum (%)", 0, 100, 0)
+            # Options d'intersection
+            st.subheader("Options d'intersection")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                wa = st.checkbox("Inclure régions A (-wa)", value=True)
+                wb = st.checkbox("Inclure régions B (-wb)", value=True)
+            with col2:
+                wo = st.checkbox("Ajouter longueur overlap (-wo)", value=False)
+                v = st.checkbox("Trouver non-intersections (-v)", value=False)
+            with col3:
+                min_overlap = st.slider("Recouvrement minimum (%)", 0, 100, 0)
         
-        # Bouton pour lancer l'intersection
-        if st.button("Lancer l'intersection"):
-            with st.spinner("Calcul de l'intersection en cours..."):
-                options = {
-                    'wa': wa,
-                    'wb': wb,
-                    'wo': wo,
-                    'v': v,
-                    'f': min_overlap / 100.0
-                }
+            # Bouton pour lancer l'intersection
+            if st.button("Lancer l'intersection"):
+                with st.spinner("Calcul de l'intersection en cours..."):
+                    options = {
+                        'wa': wa,
+                        'wb': wb,
+                        'wo': wo,
+                        'v': v,
+                        'f': min_overlap / 100.0
+                    }
                 
-                result_df = intersect_bedtools_advanced(df1, df2, options)
+                    result_df = intersect_bedtools_advanced(df1, df2, options)
                 
-                if result_df is not None:
-                    if len(result_df) > 0:
-                        st.success(f"✅ Intersection terminée: {len(result_df)} régions trouvées")
-                        st.dataframe(result_df.head(100))
+                    if result_df is not None:
+                        if len(result_df) > 0:
+                            st.success(f"✅ Intersection terminée: {len(result_df)} régions trouvées")
+                            st.dataframe(result_df.head(100))
                         
-                        # Téléchargement des résultats
-                        csv = result_df.to_csv(index=False, sep='\t')
-                        st.download_button(
-                            label="Télécharger les résultats",
-                            data=csv,
-                            file_name="intersection_results.bed",
-                            mime="text/tab-separated-values"
-                        )
-                    else:
-                        st.info("Aucune intersection trouvée avec les paramètres actuels")
\ No newline at end of file
+                            # Téléchargement des résultats (TSV écrit directement en octets)
+                            buf = io.BytesIO()
+                            write_tsv(result_df, buf)
+                            st.download_button(
+                                label="Télécharger les résultats",
+                                data=buf.getvalue(),
+                                file_name="intersection_results.bed",
+                                mime="text/tab-separated-values"
+                            )
+                        else:
+                            st.info("Aucune intersection trouvée avec les paramètres actuels")
\ No newline at end of file
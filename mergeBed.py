@@ -1,40 +1,37 @@
+import io
+import numpy as np
 import pandas as pd
 import streamlit as st
 from preview import load_bed, show_metrics_banner, show_data_preview  # ⬅️ CORRIGÉ ICI
+from sort import sort_bed
+from bed_io import write_tsv
 
 def merge_bed_files(df: pd.DataFrame) -> pd.DataFrame:
     """Merges a BED dataframe with itself"""
-    # Columns normalization
-    cols = ['chrom', 'start', 'end']
-    #df = df[cols].copy()
-    df
-    
-    # Numeric conversion and cleaning
-    df['start'] = pd.to_numeric(df['start'], errors='coerce')
-    df['end'] = pd.to_numeric(df['end'], errors='coerce')
-    df.dropna(inplace=True)
-    
-    # Interval sorting
-    df = df.sort_values(cols)
-    
-    # Interval merging
-    merged = []
-    current = None
-    
-    for _, row in df.iterrows():
-        if current is None:
-            current = dict(row)
-        elif (row['chrom'] == current['chrom'] and 
-              row['start'] <= current['end']):
-            current['end'] = max(current['end'], row['end'])
-        else:
-            merged.append(current)
-            current = dict(row)
-    
-    if current:
-        merged.append(current)
-    
-    return pd.DataFrame(merged)
+    # Numeric conversion and cleaning (on a copy: the caller's frame is left intact)
+    df = df.assign(start=pd.to_numeric(df['start'], errors='coerce'),
+                   end=pd.to_numeric(df['end'], errors='coerce')).dropna()
+    
+    # Interval sorting (skipped when the file is already sorted)
+    df = sort_bed(df)
+    if df.empty:
+        return df.reset_index(drop=True)
+    
+    # Interval merging, vectorized: a row opens a new cluster when it changes
+    # chromosome or starts after the running max end of its chromosome so far
+    chrom_codes = pd.factorize(df['chrom'])[0]
+    starts = df['start'].to_numpy()
+    ends = df['end'].to_numpy()
+    running_end = pd.Series(ends).groupby(chrom_codes).cummax().to_numpy()
+    
+    new_cluster = np.ones(len(df), dtype=bool)
+    new_cluster[1:] = (chrom_codes[1:] != chrom_codes[:-1]) | (starts[1:] > running_end[:-1])
+    first_rows = np.flatnonzero(new_cluster)
+    
+    # First row of each cluster, extended to the cluster's max end
+    merged = df.iloc[first_rows].reset_index(drop=True)
+    merged['end'] = np.maximum.reduceat(ends, first_rows)
+    return merged
 
 def handle_merge_operation(df: pd.DataFrame):
     """Handles the merge interface"""
@@ -55,10 +52,12 @@ def handle_merge_operation(df: pd.DataFrame):
             show_metrics_banner(result)
             st.dataframe(result.head(100))
         
-        # Download
+        # Download, encoded straight to bytes
+        buf = io.BytesIO()
+        write_tsv(result, buf)
         st.download_button(
             "💾 Download Merged Result",
-            result.to_csv(index=False, sep='\t').encode('utf-8'),
+            buf.getvalue(),
             "merged_result.bed",
             "text/plain"
         )
\ No newline at end of file
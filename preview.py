@@ -1,41 +1,24 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 from typing import Optional
+from bed_io import FRAME_HASH_FUNCS, UPLOAD_HASH_FUNCS, read_bed
 
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs=UPLOAD_HASH_FUNCS)
 def load_bed(uploaded_file) -> Optional[pd.DataFrame]:
     """
     Load a BED file with ALL its columns
     """
     try:
-        # Read the file without column limit
-        df = pd.read_csv(
-            uploaded_file,
-            sep="\t",
-            header=None,
-            comment='#',
-            dtype=str  # ← Read everything as string first
-        )
-        
-        # Define standard BED column names
-        bed_cols = ['chrom', 'start', 'end', 'name', 'score', 'strand', 
-                   'thickStart', 'thickEnd', 'itemRgb', 'blockCount', 
-                   'blockSizes', 'blockStarts']
-        
-        # Name available columns
-        df.columns = bed_cols[:len(df.columns)]
-        
-        # Convert start and end to numeric
-        if 'start' in df.columns:
-            df['start'] = pd.to_numeric(df['start'], errors='coerce')
-        if 'end' in df.columns:
-            df['end'] = pd.to_numeric(df['end'], errors='coerce')
+        df = read_bed(uploaded_file)
         
         # Validate
         if len(df.columns) < 3:
             st.error("❌ Invalid BED format: minimum 3 columns required")
             return None
             
-        if (df["start"] > df["end"]).any():
+        # Compare the raw arrays: no intermediate boolean Series
+        if np.any(df["start"].to_numpy() > df["end"].to_numpy()):
             st.error("❌ Error: start positions > end positions detected")
             return None
             
@@ -55,20 +38,29 @@ def load_bed_basic(uploaded_file) -> Optional[pd.DataFrame]:
         return df[['chrom', 'start', 'end']].copy()
     return None
 
-def show_metrics_banner(df, genome_size=3_299_210_039):
-    """Display a comprehensive single-line file summary with colored backgrounds"""
-    if df is None or df.empty:
-        return
-        
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def null_counts(df: pd.DataFrame) -> pd.Series:
+    """Nulls per column, shared by the metrics banner and the data quality tab"""
+    return df.isnull().sum()
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def bed_metrics(df: pd.DataFrame, genome_size: int = 3_299_210_039) -> dict:
+    """Summary stats shown by the metrics banner, computed once per dataframe"""
     # Calculate all metrics
     length = df['end'] - df['start']
     duplicates = df.duplicated().sum()
-    null_values = df.isnull().sum().sum()
+    null_values = null_counts(df).sum()
     total_bases = length.sum()
     coverage_percent = (total_bases / genome_size) * 100
     
-    # Check if strand column exists
-    strand_stats = df['strand'].value_counts(normalize=True).to_dict() if 'strand' in df else None
+    # Check if strand column exists: shares counted with one bincount over the category codes
+    strand_stats = None
+    if 'strand' in df:
+        strand = df['strand'].astype('category')
+        codes = strand.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(strand.cat.categories))
+        if counts.sum():
+            strand_stats = dict(zip(strand.cat.categories, counts / counts.sum()))
     
     # Improved stats with professional color scheme
     stats = {
@@ -89,9 +81,30 @@ def show_metrics_banner(df, genome_size=3_299_210_039):
             "➕ + strand": {"value": f"{strand_stats.get('+', 0):.1%}", "color": "#e8f5e9"},
             "➖ - strand": {"value": f"{strand_stats.get('-', 0):.1%}", "color": "#ffebee"}
         })
+    return stats
+
+def show_metrics_banner(df, genome_size=3_299_210_039):
+    """Display a comprehensive single-line file summary with colored backgrounds"""
+    if df is None or df.empty:
+        return
     
-    # Create the metrics banner
-    st.write("""
+    # Shared by the preview, sort and merge views: reruns reuse the cached stats
+    stats = bed_metrics(df, genome_size)
+    
+    # Build the whole banner as one HTML block: a single Streamlit element per render
+    items = "".join(f"""
+        <div style='text-align: center;
+                    min-width: 90px;
+                    padding: 8px;
+                    border-radius: 8px;
+                    background: {data["color"]};
+                    border: 1px solid #e0e0e0;
+                    box-shadow: 0 2px 4px rgba(0,0,0,0.05);'>
+            <div style='font-size: 12px; color: #455a64; margin-bottom: 5px; font-weight: 500;'>{name}</div>
+            <div style='font-size: 14px; font-weight: 600; color: #263238;'>{data["value"]}</div>
+        </div>""" for name, data in stats.items())
+    
+    st.markdown(f"""
     <div style='background: #f8f9fa;
                 border-radius: 8px;
                 padding: 15px;
@@ -101,27 +114,9 @@ def show_metrics_banner(df, genome_size=3_299_210_039):
                 justify-content: space-between;
                 align-items: center;
                 flex-wrap: wrap;
-                gap: 12px;'>
+                gap: 12px;'>{items}
+    </div>
     """, unsafe_allow_html=True)
-    
-    # Create columns dynamically based on stats count
-    cols = st.columns(len(stats))
-    for i, (name, data) in enumerate(stats.items()):
-        with cols[i]:
-            st.write(f"""
-            <div style='text-align: center;
-                        min-width: 90px;
-                        padding: 8px;
-                        border-radius: 8px;
-                        background: {data["color"]};
-                        border: 1px solid #e0e0e0;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.05);'>
-                <div style='font-size: 12px; color: #455a64; margin-bottom: 5px; font-weight: 500;'>{name}</div>
-                <div style='font-size: 14px; font-weight: 600; color: #263238;'>{data["value"]}</div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    st.write("</div>", unsafe_allow_html=True)
 
 def show_data_preview(df: pd.DataFrame) -> None:
     """Display data preview with ALL columns"""
@@ -140,8 +135,29 @@ def show_data_preview(df: pd.DataFrame) -> None:
     with tab2:
         show_data_quality(df)
 
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def data_quality_stats(df: pd.DataFrame) -> dict:
+    """Column scans behind the data quality tab, computed once per dataframe"""
+    null_details = null_counts(df).to_frame("Null Values")
+    null_details["Percentage"] = (null_details["Null Values"] / len(df) * 100).round(2)
+    dtype_details = pd.DataFrame({
+        'Column': df.columns,
+        'Type': df.dtypes.astype(str).values,
+        'Unique Values': df.nunique().values
+    })
+    return {
+        "n_chrom": df["chrom"].nunique(),
+        "total_size": (df['end'] - df['start']).sum(),
+        "null_count": null_details["Null Values"].sum(),
+        "null_details": null_details,
+        "dtype_details": dtype_details,
+        "strand_dist": df['strand'].value_counts(normalize=True) if 'strand' in df else None
+    }
+
 def show_data_quality(df: pd.DataFrame) -> None:
     """Display data quality statistics with colored backgrounds"""
+    quality = data_quality_stats(df)
+    
     st.subheader("🧬 Distinct Values")
     col1, col2, col3, col4 = st.columns(4)
     
@@ -156,12 +172,12 @@ def show_data_quality(df: pd.DataFrame) -> None:
                     text-align: center;
                     border: 1px solid #e0e0e0;'>
             <h3 style='margin: 0; color: #455a64;'>Chromosomes</h3>
-            <p style='font-size: 24px; font-weight: bold; margin: 5px 0; color: #263238;'>{df["chrom"].nunique()}</p>
+            <p style='font-size: 24px; font-weight: bold; margin: 5px 0; color: #263238;'>{quality["n_chrom"]}</p>
         </div>
         """, unsafe_allow_html=True)
     
     with col2:
-        total_size = (df['end'] - df['start']).sum()
+        total_size = quality["total_size"]
         st.markdown(f"""
         <div style='background-color: {colors[1]}; 
                     padding: 15px; 
@@ -174,7 +190,7 @@ def show_data_quality(df: pd.DataFrame) -> None:
         """, unsafe_allow_html=True)
     
     with col3:
-        null_count = df.isnull().sum().sum()
+        null_count = quality["null_count"]
         st.markdown(f"""
         <div style='background-color: {colors[2]}; 
                     padding: 15px; 
@@ -200,23 +216,18 @@ def show_data_quality(df: pd.DataFrame) -> None:
     
     # Missing values analysis by column
     st.subheader("🔍 Null Values Detail")
-    null_details = df.isnull().sum().to_frame("Null Values")
-    null_details["Percentage"] = (null_details["Null Values"] / len(df) * 100).round(2)
+    null_details = quality["null_details"]
     st.table(null_details.style.background_gradient(cmap="Reds", subset=["Null Values"]))
     
     # Data types by column
     st.subheader("📊 Data Types")
-    dtype_details = pd.DataFrame({
-        'Column': df.columns,
-        'Type': [str(dtype) for dtype in df.dtypes],
-        'Unique Values': [df[col].nunique() for col in df.columns]
-    })
+    dtype_details = quality["dtype_details"]
     st.table(dtype_details.style.background_gradient(cmap="Blues", subset=["Unique Values"]))
     
     # Strand analysis if column exists
     if 'strand' in df:
         st.subheader("⚖ Strand Distribution")
-        strand_dist = df['strand'].value_counts(normalize=True)
+        strand_dist = quality["strand_dist"]
         st.bar_chart(strand_dist)
     
     # Score analysis if column exists
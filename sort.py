@@ -1,24 +1,75 @@
+import io
+import numpy as np
 import pandas as pd
 import streamlit as st
+from bed_io import FRAME_HASH_FUNCS, write_tsv
+
+def is_sorted_bed(df):
+    """
+    Vérifie en un seul passage O(n) si le DataFrame est déjà trié par chrom, start, end
+    """
+    chrom = df["chrom"]
+    # chrom catégoriel : l'ordre de tri est celui des codes
+    c = chrom.cat.codes.to_numpy() if isinstance(chrom.dtype, pd.CategoricalDtype) else chrom.to_numpy()
+    s = df["start"].to_numpy()
+    e = df["end"].to_numpy()
+    if isinstance(chrom.dtype, pd.CategoricalDtype) and (c < 0).any():
+        return False
+    # Chaque ligne doit être >= la précédente dans l'ordre lexicographique
+    ordered = (c[1:] > c[:-1]) | ((c[1:] == c[:-1]) & ((s[1:] > s[:-1]) | ((s[1:] == s[:-1]) & (e[1:] >= e[:-1]))))
+    return bool(ordered.all())
 
 def sort_bed(df):
     """
     Trie un DataFrame BED par les colonnes chrom, start, end.
     """
-    return df.sort_values(by=["chrom", "start", "end"])
+    # Fichiers déjà triés (cas courant en sortie de pipeline) : pas de tri O(n log n)
+    if is_sorted_bed(df):
+        return df
+    chrom = df["chrom"]
+    if isinstance(chrom.dtype, pd.CategoricalDtype):
+        codes = chrom.cat.codes.to_numpy()
+    else:
+        codes = pd.factorize(chrom, sort=True)[0]
+    # chrom manquant : sort_values le place en dernier, on lui laisse ce cas
+    if (codes < 0).any():
+        return df.sort_values(by=["chrom", "start", "end"])
+    # lexsort stable sur des clés entières (codes chrom, start, end) :
+    # comparaisons d'entiers au lieu de comparer des chaînes chrom
+    order = np.lexsort((df["end"].to_numpy(), df["start"].to_numpy(), codes))
+    return df.iloc[order]
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs=FRAME_HASH_FUNCS)
+def sorted_bed(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Résultat du tri mis en cache : les reruns de la vue tri ne retrient pas
+    """
+    return sort_bed(df)
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs=FRAME_HASH_FUNCS)
+def sorted_bed_tsv(df: pd.DataFrame) -> bytes:
+    """
+    Fichier trié encodé en TSV, mis en cache : sérialisé une seule fois
+    """
+    buf = io.BytesIO()
+    write_tsv(sorted_bed(df), buf)
+    return buf.getvalue()
 
 def handle_sort_operation(df: pd.DataFrame):
     """Gère l'opération de tri, affiche le résultat et propose le téléchargement"""
-    df_sorted = sort_bed(df)
+    df_sorted = sorted_bed(df)
     st.success("Sort Completed!")
     
-    # Affichage du DataFrame trié une seule fois
-    st.dataframe(df_sorted)
+    # Aperçu des 100 premières lignes : le fichier complet est dans le téléchargement
+    st.dataframe(df_sorted.head(100))
+    st.caption(f"Displaying 100 rows out of {len(df_sorted):,} total")
     
-    # Proposition de téléchargement
+    # Proposition de téléchargement : octets déjà encodés (en cache), car le
+    # bouton n'est rendu qu'au clic sur Sort et un callable différé serait
+    # supprimé par le rerun avant d'être servi
     st.download_button(
         "💾 Download Sorted Result",
-        df_sorted.to_csv(index=False, sep='\t').encode('utf-8'),
+        sorted_bed_tsv(df),
         "resultat_trie.bed",
         "text/plain"
     )